@@ -1,9 +1,11 @@
 import time
 import logging
+import threading
 import base64
 import os
 import shlex
-from typing import Optional, Callable
+import dataclasses
+from typing import Optional, Callable, NamedTuple
 from gi.repository import Gtk, GObject, Adw, Gdk, Gio, Pango, GLib
 
 from .State import state
@@ -12,13 +14,76 @@ from .models.UpdateManager import UpdateManager, UpdateManagerChecker
 from .models.AppListElement import InstalledStatus
 from .providers.AppImageProvider import AppImageListElement, AppImageUpdateLogic
 from .providers.providers_list import appimage_provider
-from .lib.async_utils import _async, idle, debounce
+from .lib.async_utils import _async, _async_keepalive, idle
 from .lib.json_config import read_json_config, set_json_config, read_config_for_app, save_config_for_app
-from .lib.utils import url_is_valid, get_file_hash, get_application_window, show_message_dialog
+from .lib.utils import url_is_valid, get_file_hashes, get_application_window, show_message_dialog, append_all, fast_split
 from .components.CustomComponents import CenteringBox, LabelStart
 from .components.AppDetailsConflictModal import AppDetailsConflictModal
 
 
+COMMON_BTN_CSS_CLASSES = ['pill', 'text-button']
+
+
+class ActionButtonsState(NamedTuple):
+    """Labels, css classes and sensitivity of the action buttons for an installation status, None leaves a property untouched"""
+    primary_label: Optional[str] = None
+    primary_css: list = COMMON_BTN_CSS_CLASSES
+    primary_sensitive: bool = True
+    secondary_label: Optional[str] = None
+    secondary_css: list = COMMON_BTN_CSS_CLASSES
+    secondary_sensitive: bool = True
+    update_sensitive: Optional[bool] = None
+
+
+def build_action_buttons_states(cancel_update_label: str) -> dict[tuple[InstalledStatus, bool], ActionButtonsState]:
+    """Returns the action buttons state for every (installed status, runs in terminal) pair"""
+    destructive_css = [*COMMON_BTN_CSS_CLASSES, 'destructive-action']
+    suggested_css = [*COMMON_BTN_CSS_CLASSES, 'suggested-action']
+    states = {}
+
+    for is_terminal in [False, True]:
+        launch_label = _('This app runs in the terminal') if is_terminal else _('Launch')
+
+        states[(InstalledStatus.INSTALLED, is_terminal)] = ActionButtonsState(
+            primary_label=_('Remove'), primary_css=destructive_css, secondary_label=launch_label)
+
+        states[(InstalledStatus.UNINSTALLING, is_terminal)] = ActionButtonsState(
+            primary_label=_('Uninstalling...'), primary_sensitive=False)
+
+        states[(InstalledStatus.INSTALLING, is_terminal)] = ActionButtonsState(
+            primary_label=_('Installing...'), primary_sensitive=False)
+
+        states[(InstalledStatus.NOT_INSTALLED, is_terminal)] = ActionButtonsState(
+            primary_label=_('Move to the app menu'), primary_css=suggested_css,
+            secondary_label=launch_label, secondary_sensitive=(not is_terminal))
+
+        states[(InstalledStatus.UPDATE_AVAILABLE, is_terminal)] = ActionButtonsState(
+            primary_label=_('Remove'), primary_css=destructive_css,
+            secondary_label=_('Update'), secondary_css=suggested_css)
+
+        states[(InstalledStatus.UPDATING, is_terminal)] = ActionButtonsState(
+            primary_label=cancel_update_label, primary_css=destructive_css,
+            secondary_sensitive=False, update_sensitive=False)
+
+        states[(InstalledStatus.ERROR, is_terminal)] = ActionButtonsState(
+            primary_label=_('Error'), primary_css=destructive_css)
+
+        states[(InstalledStatus.UNKNOWN, is_terminal)] = ActionButtonsState()
+
+    return states
+
+
+@dataclasses.dataclass
+class LoadPayload():
+    """Everything complete_load needs, computed outside of the main thread"""
+    el: AppImageListElement
+    icon: Gtk.Image
+    generation: str
+    description: str
+    app_conf: dict
+    system_arch: str
+
+
 class AppDetails(Gtk.ScrolledWindow):
     """The presentation screen for an application"""
     __gsignals__ = {
@@ -31,16 +96,39 @@ class AppDetails(Gtk.ScrolledWindow):
     UPDATE_NOT_AVAIL_BTN_LABEL = _('No updates available')
     UPDATE_INFO_EMBEDDED = _('This application includes update information provided by the developer')
     UPDATE_INFO_NOT_EMBEDDED = _('Manage update details for this application')
+    LAUNCHING_BTN_LABEL = _('Launching...')
+    HASH_CALCULATING = _('Calculating...')
+    BANNER_EXTERNAL_FOLDER = _('This app is located outside the default folder\n<small>You can hide external apps in the settings</small>')
+    BANNER_UNTRUSTED = _('Please, verify the source of this app before opening it')
+    BANNER_UNLOCK_BTN_LABEL = _('Unlock')
+    BANNER_INVALID_ARCH = _('This app might not be compatible with your system architecture')
+    ENV_VAR_KEY_PLACEHOLDER = _('Key')
+    ENV_VAR_VALUE_PLACEHOLDER = _('Value')
+    ACTION_BUTTONS_STATES = build_action_buttons_states(CANCEL_UPDATE)
+    EXTRA_DATA_SPACING = 20
+    EXTRA_DATA_SPACING_HALF = EXTRA_DATA_SPACING // 2
 
 
     def __init__(self):
         super().__init__()
         self.current_update_manager: Optional[UpdateManager] = None
+        self._last_update_pct: Optional[int] = None
+        self._pending_update_pct: Optional[int] = None
+        self._update_pct_scheduled = False
+        self._update_pct_source = 0
+        self._last_update_pct_push = 0.0
         self.ACTION_ROW_ICON_SIZE = 34
-        self.EXTRA_DATA_SPACING = 20
 
         self.app_list_element: AppImageListElement = None
-        self.common_btn_css_classes = ['pill', 'text-button']
+        self._app_conf: Optional[dict] = None
+        self._pending_app_conf_patch: dict = {}
+        self._debounce_sources: dict[str, tuple[int, Callable, tuple]] = {}
+        self._flush_source = 0
+        self._post_launch_source = 0
+        self.common_btn_css_classes = COMMON_BTN_CSS_CLASSES
+        self._applied_btn_props = {}
+        self._last_status_key: Optional[tuple] = None
+        self._installed_index_cache: Optional[dict[str, AppImageListElement]] = None
 
         self.main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, margin_top=10, margin_bottom=10, margin_start=20, margin_end=20)
 
@@ -59,11 +147,11 @@ class AppDetails(Gtk.ScrolledWindow):
             selectable=True,
         )
 
-        [title_col.append(el) for el in [self.title, self.app_subtitle]]
+        append_all(title_col, self.title, self.app_subtitle)
 
         self.source_selector_hdlr = None
-        self.source_selector = Gtk.ComboBoxText()
-        self.source_selector_revealer = Gtk.Revealer(child=self.source_selector, transition_type=Gtk.RevealerTransitionType.CROSSFADE)
+        self.source_selector: Optional[Gtk.ComboBoxText] = None
+        self.source_selector_revealer: Optional[Gtk.Revealer] = None
 
         # Action buttons
         self.primary_action_button = Gtk.Button(label='', valign=Gtk.Align.CENTER, halign=Gtk.Align.CENTER, 
@@ -71,7 +159,7 @@ class AppDetails(Gtk.ScrolledWindow):
         self.secondary_action_button = Gtk.Button(label='', valign=Gtk.Align.CENTER, 
                                             css_classes=self.common_btn_css_classes, width_request=200)
         self.update_action_button = Gtk.Button(
-            label=_('Update'), 
+            label=self.UPDATE_BTN_LABEL, 
             valign=Gtk.Align.CENTER, 
             width_request=200,
             css_classes=[*self.common_btn_css_classes, 'suggested-action'],
@@ -84,10 +172,10 @@ class AppDetails(Gtk.ScrolledWindow):
         self.update_action_button.connect('clicked', self.update_action_button_clicked)
         
         primary_action_buttons_row = CenteringBox(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        [primary_action_buttons_row.append(el) for el in [self.secondary_action_button, self.update_action_button]]
-        [action_buttons_row.append(el) for el in [primary_action_buttons_row, self.primary_action_button]]
+        append_all(primary_action_buttons_row, self.secondary_action_button, self.update_action_button)
+        append_all(action_buttons_row, primary_action_buttons_row, self.primary_action_button)
 
-        [self.details_row.append(el) for el in [self.icon_slot, title_col, action_buttons_row]]
+        append_all(self.details_row, self.icon_slot, title_col, action_buttons_row)
 
         # preview row
         self.previews_row = Gtk.Box(
@@ -99,16 +187,21 @@ class AppDetails(Gtk.ScrolledWindow):
         # row
         self.desc_row = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, margin_top=20, margin_bottom=20)
         self.description = Gtk.Label(label='', halign=Gtk.Align.START, wrap=True, selectable=True)
+        self._last_description_text = ''
 
         self.desc_row_spinner = Gtk.Spinner(spinning=True, visible=True)
-        [self.desc_row.append(el) for el in [self.desc_row_spinner, self.description]]
+        append_all(self.desc_row, self.desc_row_spinner, self.description)
 
         # row
         self.third_row = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         self.extra_data = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=self.EXTRA_DATA_SPACING)
         self.third_row.append(self.extra_data)
+        self._extra_data_built_for: Optional[tuple] = None
+        self._extra_data_installed_layout: Optional[bool] = None
+        self._rows: dict[str, Gtk.Widget] = {}
+        self._rows_hdlrs: dict[str, int] = {}
 
-        [self.main_box.append(el) for el in [self.details_row, self.previews_row, self.desc_row, self.third_row]]
+        append_all(self.main_box, self.details_row, self.previews_row, self.desc_row, self.third_row)
 
         clamp = Adw.Clamp(child=self.main_box, maximum_size=600, margin_top=10, margin_bottom=20)
 
@@ -117,10 +210,16 @@ class AppDetails(Gtk.ScrolledWindow):
         self.window_banner.connect('button-clicked', self.after_trust_buttons_interaction)
 
         container_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
-        [container_box.append(el) for el in [self.window_banner, clamp]]
+        append_all(container_box, self.window_banner, clamp)
 
         self.env_variables_widgets = []
+        self._env_key_counts: dict[str, int] = {}
+        self._env_last_key: dict[Gtk.Entry, str] = {}
         self.env_variables_group_container = None
+        self.env_variables_expander: Optional[Adw.ExpanderRow] = None
+        self.env_variables_count_label: Optional[Gtk.Label] = None
+        self._env_vars_expanded_hdlr: Optional[int] = None
+        self._env_vars_grid_rows = 0
         self.save_vars_btn: Optional[Gtk.Button] = None
 
         # Update url entry
@@ -132,11 +231,30 @@ class AppDetails(Gtk.ScrolledWindow):
 
         self.set_child(container_box)
 
+    def ensure_source_selector(self) -> Gtk.ComboBoxText:
+        # The source selector is never shown for AppImages, only create it when needed
+        if not self.source_selector:
+            self.source_selector = Gtk.ComboBoxText()
+            self.source_selector_revealer = Gtk.Revealer(child=self.source_selector, 
+                                                         transition_type=Gtk.RevealerTransitionType.CROSSFADE)
+
+        return self.source_selector
+
     def set_app_list_element(self, el: AppImageListElement):
+        self.flush_app_edits()
+        self.cancel_post_launch_animation()
         self.app_list_element = el
+        self._app_conf = None
         self.provider = appimage_provider
+        self.refresh_is_terminal()
+        self._last_status_key = None
+        self._installed_index_cache = None
         self.update_action_button.set_visible(False)
 
+        if el.installed_status is not InstalledStatus.INSTALLED:
+            # A local file might have been replaced at the same path, hash it again
+            self._extra_data_built_for = None
+
         self.load()
 
     def set_from_local_file(self, file: Gio.File):
@@ -150,67 +268,66 @@ class AppDetails(Gtk.ScrolledWindow):
         return False
 
     @idle
-    def complete_load(self, icon: Gtk.Image, generation: str, load_completed_callback: Optional[Callable] = None):
+    def complete_load(self, payload: LoadPayload, load_completed_callback: Optional[Callable] = None):
+        if payload.el is not self.app_list_element:
+            # Another app was opened while this payload was being prepared
+            return
+
         self.show_row_spinner(True)
 
         self.details_row.remove(self.icon_slot)
-        self.icon_slot = icon
-        icon.set_pixel_size(128)
+        self.icon_slot = payload.icon
+        self.icon_slot.set_pixel_size(128)
 
         self.details_row.prepend(self.icon_slot)
-        self.title.set_label(self.app_list_element.name)
 
-        self.app_subtitle.set_text(self.app_list_element.version)
+        # Changing a label text triggers a new text layout, skip it when the text is the same
+        if self.title.get_label() != self.app_list_element.name:
+            self.title.set_label(self.app_list_element.name)
+
+        if self.app_subtitle.get_text() != self.app_list_element.version:
+            self.app_subtitle.set_text(self.app_list_element.version)
+
         self.app_subtitle.set_visible(len(self.app_list_element.version))
         self.app_subtitle.set_selectable(self.app_list_element.installed_status is not InstalledStatus.INSTALLED)
 
-        self.description.set_label(
-            self.provider.get_description(self.app_list_element)
-        )
+        if self._last_description_text != payload.description:
+            self.description.set_label(payload.description)
+            self._last_description_text = payload.description
 
-        self.third_row.remove(self.extra_data)
-        
-        self.extra_data = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=self.EXTRA_DATA_SPACING)
-        self.third_row.append(self.extra_data)
-
-        self.install_button_label_info = None
+        # The extra data rows only depend on the file and its status:
+        # they are built once for each layout (installed or not) and then refreshed in place
+        built_for = (self.app_list_element.file_path, self.app_list_element.installed_status)
+        installed_layout = self.app_list_element.installed_status is InstalledStatus.INSTALLED
 
-        # Load the boxed list with additional information
-        gtk_list = Gtk.ListBox(css_classes=['boxed-list'])
+        if self._extra_data_built_for != built_for:
+            if self._extra_data_installed_layout is installed_layout:
+                self.refresh_extra_data(payload)
+            else:
+                self.build_extra_data(payload)
+                self._extra_data_installed_layout = installed_layout
 
-        # Package info
-        gtk_list.append(self.create_package_info_row(generation))
+            self._extra_data_built_for = built_for
 
-        # The path of the executable
-        gtk_list.append(self.create_exec_path_row())
+            if not installed_layout:
+                # Hashing a big file takes a while, the row is filled in when it's done
+                self.load_hashes(self.app_list_element)
+        else:
+            self.set_row_subtitle('package_info', self.get_package_info_subtitle(payload.generation))
 
-        # Hashes
-        if self.app_list_element.installed_status is not InstalledStatus.INSTALLED:
-            gtk_list.append(self.create_app_hash_row())
-        
+        self.install_button_label_info = None
         self.update_installation_status()
 
-        system_arch = sandbox_sh(['arch'])
+        system_arch = payload.system_arch
 
         if self.app_list_element.installed_status is InstalledStatus.INSTALLED:
-            # Exec arguments
-            gtk_list.append(self.create_show_exec_args_row())
-
-            # A custom link to a website
-            gtk_list.append(self.create_edit_custom_website_row())
-
-            # Reload metadata row
-            reload_data_listbox = Gtk.ListBox(css_classes=['boxed-list'])
-            reload_data_listbox.append(self.create_reload_metadata_row())
-            self.extra_data.prepend(reload_data_listbox)
-
             # Show or hide window banner
             if system_arch and system_arch != self.app_list_element.architecture:
                 self.show_invalid_arch_banner()
             elif self.app_list_element.external_folder:
                 self.window_banner.set_revealed(True)
                 self.window_banner.set_button_label(None)
-                self.window_banner.set_title(_('This app is located outside the default folder\n<small>You can hide external apps in the settings</small>'))
+                self.window_banner.set_title(self.BANNER_EXTERNAL_FOLDER)
             else:
                 self.window_banner.set_revealed(False)
         else:
@@ -221,38 +338,124 @@ class AppDetails(Gtk.ScrolledWindow):
                     self.window_banner.set_revealed(False)
             else:
                 self.window_banner.set_revealed(True)
-                self.window_banner.set_title(_('Please, verify the source of this app before opening it'))
-                self.window_banner.set_button_label(_('Unlock'))
+                self.window_banner.set_title(self.BANNER_UNTRUSTED)
+                self.window_banner.set_button_label(self.BANNER_UNLOCK_BTN_LABEL)
 
             if not self.app_list_element.trusted:
                 self.secondary_action_button.set_sensitive(False)
                 self.primary_action_button.set_sensitive(False)
 
+        if self.app_list_element.installed_status is InstalledStatus.INSTALLED:
+            self.update_action_button.set_visible(False)
+            self.check_updates()
+
+        self.show_row_spinner(False)
+
+        self.desc_row.set_visible(len(self.description.get_text()) > 0)
+
+        if load_completed_callback:
+            load_completed_callback()
+
+    def build_extra_data(self, payload: LoadPayload):
+        self.third_row.remove(self.extra_data)
+        
+        self.extra_data = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=self.EXTRA_DATA_SPACING)
+        self.third_row.append(self.extra_data)
+
+        # Load the boxed list with additional information
+        gtk_list = Gtk.ListBox(css_classes=['boxed-list'])
+
+        self._rows = {}
+        self._rows_hdlrs = {}
+
+        # Package info
+        self._rows['package_info'] = self.create_package_info_row(payload.generation)
+        gtk_list.append(self._rows['package_info'])
+
+        # The path of the executable
+        self._rows['exec_path'] = self.create_exec_path_row()
+        gtk_list.append(self._rows['exec_path'])
+
+        # Hashes
+        if self.app_list_element.installed_status is not InstalledStatus.INSTALLED:
+            self._rows['hash'] = self.create_app_hash_row()
+            gtk_list.append(self._rows['hash'])
+
+        if self.app_list_element.installed_status is InstalledStatus.INSTALLED:
+            # Exec arguments
+            self._rows['exec_args'] = self.create_show_exec_args_row()
+            gtk_list.append(self._rows['exec_args'])
+
+            # A custom link to a website
+            self._rows['website'] = self.create_edit_custom_website_row(payload.app_conf)
+            gtk_list.append(self._rows['website'])
+
+            # Reload metadata row
+            reload_data_listbox = Gtk.ListBox(css_classes=['boxed-list'])
+            self._rows['reload_metadata'] = self.create_reload_metadata_row()
+            reload_data_listbox.append(self._rows['reload_metadata'])
+            self.extra_data.append(reload_data_listbox)
+
         self.extra_data.append(gtk_list)
 
         if self.app_list_element.installed_status is InstalledStatus.INSTALLED:
-            self.update_url_group = self.create_edit_update_url_row()
+            self.update_url_group = self.create_edit_update_url_row(payload.app_conf)
             self.extra_data.append(self.update_url_group)
 
             edit_env_vars_widget = self.create_edit_env_vars_row()
             self.extra_data.append(edit_env_vars_widget)
 
-            self.update_action_button.set_visible(False)
-            self.check_updates()
+    def refresh_extra_data(self, payload: LoadPayload):
+        """Updates the rows created by build_extra_data with the data of the current app"""
+        self.set_row_subtitle('package_info', self.get_package_info_subtitle(payload.generation))
+        self.set_row_subtitle('exec_path', self.app_list_element.file_path)
 
-        self.show_row_spinner(False)
+        if self.app_list_element.installed_status is not InstalledStatus.INSTALLED:
+            self.set_row_subtitle('hash', self.HASH_CALCULATING)
+            return
 
-        self.desc_row.set_visible(len(self.description.get_text()) > 0)
+        website = payload.app_conf.get('website', '')
+        self._rows['website'].set_title(_('Website') if website else _('Add a website'))
+        self.set_row_text('website', website)
+        self.reset_validation_css(self._rows['website'])
+        self.set_row_text('exec_args', ' '.join(self.app_list_element.exec_arguments))
+        self._rows['reload_metadata'].set_sensitive(True)
 
-        if load_completed_callback:
-            load_completed_callback()
+        self.refresh_update_url_group(payload.app_conf)
+        self.reset_env_vars_rows()
+
+    def set_row_subtitle(self, name: str, subtitle: str):
+        row = self._rows[name]
+
+        if row.get_subtitle() != subtitle:
+            row.set_subtitle(subtitle)
+
+    def reset_validation_css(self, widget: Gtk.Widget):
+        # The entry rows are reused, drop the outcome of the last validation
+        widget.remove_css_class('success')
+        widget.remove_css_class('error')
+
+    def set_row_text(self, name: str, text: str):
+        # Changes the text of an entry row without running its "changed" handler
+        row = self._rows[name]
+
+        if row.get_text() != text:
+            with row.handler_block(self._rows_hdlrs[name]):
+                row.set_text(text)
 
-    @_async
     def load(self, load_completed_callback: Optional[Callable] = None):
+        # The config is read again, save the pending edits first
+        self.load_in_background(self.flush_app_edits(), load_completed_callback)
+
+    @_async
+    def load_in_background(self, pending_write: Optional[threading.Thread], 
+                           load_completed_callback: Optional[Callable] = None):
+        if pending_write:
+            pending_write.join()
+
+        self._app_conf = None
         self.show_row_spinner(True)
         icon = Gtk.Image(icon_name='application-x-executable-symbolic')
-        generation = self.provider.get_appimage_generation(self.app_list_element)
-
 
         if self.app_list_element.trusted:
             icon = self.provider.get_icon(self.app_list_element)
@@ -261,11 +464,44 @@ class AppDetails(Gtk.ScrolledWindow):
                 self.provider.refresh_title(self.app_list_element)
 
         self.complete_load(
-            icon,
-            generation,
+            self.create_load_payload(icon),
             load_completed_callback=load_completed_callback
         )
 
+    def create_load_payload(self, icon: Gtk.Image) -> LoadPayload:
+        # Runs outside of the main thread, as it reads files and spawns processes
+        el = self.app_list_element
+        self.refresh_is_terminal()
+
+        payload = LoadPayload(
+            el=el,
+            icon=icon,
+            generation=self.provider.get_appimage_generation(el),
+            description=self.provider.get_description(el),
+            app_conf=self.get_config_for_app(),
+            system_arch=sandbox_sh(['arch']),
+        )
+
+        return payload
+
+    @_async
+    def load_hashes(self, el: AppImageListElement):
+        try:
+            hashes = get_file_hashes(Gio.File.new_for_path(el.file_path))
+        except Exception as e:
+            logging.error(str(e))
+            hashes = None
+
+        GLib.idle_add(self.complete_load_hashes, el, hashes)
+
+    def complete_load_hashes(self, el: AppImageListElement, hashes: Optional[dict[str, str]]):
+        # The page might show another app, or the same one installed, by now
+        if el is self.app_list_element and el.installed_status is not InstalledStatus.INSTALLED \
+            and 'hash' in self._rows:
+            self.set_row_subtitle('hash', self.get_hash_subtitle(hashes) if hashes else '')
+
+        return GLib.SOURCE_REMOVE
+
     @_async
     def install_file(self, el: AppImageListElement):
         try:
@@ -273,13 +509,24 @@ class AppDetails(Gtk.ScrolledWindow):
         except Exception as e:
             logging.error(str(e))
 
+        self._installed_index_cache = None
+
         self.update_installation_status()
 
         self.complete_load(
-            self.provider.get_icon(self.app_list_element),
-            self.provider.get_appimage_generation(self.app_list_element),
+            self.create_load_payload(self.provider.get_icon(self.app_list_element))
         )
 
+    def _installed_by_name(self, name: str) -> Optional[AppImageListElement]:
+        # Listing the installed apps parses every desktop file, do it once per page
+        if self._installed_index_cache is None:
+            self._installed_index_cache = {}
+
+            for el in self.provider.list_installed():
+                self._installed_index_cache.setdefault(el.name, el)
+
+        return self._installed_index_cache.get(name)
+
     def on_conflict_modal_close(self, widget, data: str):
         if data == 'cancel':
             self.app_list_element.update_logic = None
@@ -294,19 +541,23 @@ class AppDetails(Gtk.ScrolledWindow):
             self.update_installation_status()
 
             self.provider.uninstall(self.app_list_element)
+            self.cancel_debounced()
+            self.cancel_app_conf_flush()
+            self._pending_app_conf_patch = {}
+            self._installed_index_cache = None
             
-            app_config = self.get_config_for_app()
-            conf = read_json_config('apps')
+            conf, app_config = self._read_apps_and_conf()
 
             if 'b64name' in app_config and app_config['b64name'] in conf:
                 del conf[app_config['b64name']]
                 set_json_config('apps', conf)
+                self._app_conf = None
             else:
                 logging.warn('Missing app key from app config')
 
             self.emit('uninstalled-app', self)
         elif self.app_list_element.installed_status == InstalledStatus.NOT_INSTALLED:
-            if self.provider.is_updatable(self.app_list_element) and not self.app_list_element.update_logic:
+            if self._installed_by_name(self.app_list_element.name) and not self.app_list_element.update_logic:
                 confirm_modal = AppDetailsConflictModal(app_name=self.app_list_element.name)
 
                 confirm_modal.modal.connect('response', self.on_conflict_modal_close)
@@ -319,10 +570,7 @@ class AppDetails(Gtk.ScrolledWindow):
                 self.update_installation_status()
 
                 if self.app_list_element.update_logic and (self.app_list_element.update_logic == AppImageUpdateLogic.REPLACE):
-                    old_version = next(
-                        filter(lambda old_v: (old_v.name == self.app_list_element.name), self.provider.list_installed()), 
-                        None
-                    )
+                    old_version = self._installed_by_name(self.app_list_element.name)
 
                     self.app_list_element.updating_from = old_version
                     self.provider.uninstall(old_version)
@@ -336,14 +584,12 @@ class AppDetails(Gtk.ScrolledWindow):
 
     def on_secondary_action_button_clicked(self, button: Gtk.Button):
         if self.app_list_element.installed_status in [InstalledStatus.INSTALLED, InstalledStatus.NOT_INSTALLED]:
-            is_terminal = self.app_list_element.desktop_entry and self.app_list_element.desktop_entry.getTerminal()
-            if self.app_list_element.trusted and (not is_terminal):
+            if self.app_list_element.trusted and (not self.app_list_element._is_terminal):
                 try:
                     self.app_list_element.set_trusted()
                     
-                    pre_launch_label = self.secondary_action_button.get_label()
-                    self.secondary_action_button.set_label(_('Launching...'))
-                    self.secondary_action_button.set_sensitive(False)
+                    self.secondary_action_button.set_properties(label=self.LAUNCHING_BTN_LABEL, sensitive=False)
+                    self._applied_btn_props.pop('secondary_label', None)
 
                     try:
                         self.provider.run(self.app_list_element)
@@ -351,13 +597,19 @@ class AppDetails(Gtk.ScrolledWindow):
                         logging.error(e)
                         show_message_dialog(_('Error'), str(e))
 
-                    self.post_launch_animation(restore_as=pre_launch_label)
+                    self.post_launch_animation()
 
                 except Exception as e:
                     logging.error(str(e))
 
-    @_async
     def update_action_button_clicked(self, w):
+        self.update_app(self.flush_app_edits())
+
+    @_async
+    def update_app(self, pending_write: Optional[threading.Thread]):
+        if pending_write:
+            pending_write.join()
+
         self.app_list_element.set_installed_status(InstalledStatus.UPDATING)
         self.update_installation_status()
 
@@ -369,9 +621,11 @@ class AppDetails(Gtk.ScrolledWindow):
 
         try:
             self.current_update_manager = manager
-            self.app_list_element = appimage_provider.update_from_url(manager, self.app_list_element, status_cb= lambda s: \
-                GLib.idle_add(lambda: self.update_action_button.set_label(str(round(s * 100)) + ' %')
-            ))
+            self._last_update_pct = None
+            self.app_list_element = appimage_provider.update_from_url(manager, self.app_list_element, 
+                                                                      status_cb=self.on_update_progress)
+            self._app_conf = None
+            self._extra_data_built_for = None
         except Exception as e:
             self.show_update_error_dialog(str(e))
 
@@ -379,7 +633,7 @@ class AppDetails(Gtk.ScrolledWindow):
         self.current_update_manager = None
         manager.cleanup()
 
-        GLib.idle_add(lambda: self.update_action_button.set_label(_('Update')))
+        GLib.idle_add(self.restore_update_action_button)
         self.check_updates()
 
         self.provider.reload_metadata(self.app_list_element)
@@ -387,10 +641,48 @@ class AppDetails(Gtk.ScrolledWindow):
         icon = self.provider.get_icon(self.app_list_element)
         self.provider.refresh_title(self.app_list_element)
 
-        generation = self.provider.get_appimage_generation(self.app_list_element)
-        self.complete_load(icon, generation)
+        self.complete_load(self.create_load_payload(icon))
         self.update_installation_status()
 
+    def on_update_progress(self, s: float):
+        # Called from the download thread: keep only the latest value 
+        # and refresh the label at most every 50ms
+        self._pending_update_pct = round(s * 100)
+
+        if self._update_pct_scheduled:
+            return
+
+        self._update_pct_scheduled = True
+        GLib.idle_add(self.schedule_update_progress_flush)
+
+    def schedule_update_progress_flush(self):
+        # Runs on the main loop, the source id is never touched by the download thread
+        elapsed_ms = (time.monotonic() - self._last_update_pct_push) * 1000
+        self._update_pct_source = GLib.timeout_add(max(0, int(50 - elapsed_ms)), self.flush_update_progress)
+        return GLib.SOURCE_REMOVE
+
+    def flush_update_progress(self):
+        self._update_pct_scheduled = False
+        self._update_pct_source = 0
+        self._last_update_pct_push = time.monotonic()
+        pct = self._pending_update_pct
+
+        if pct != self._last_update_pct:
+            self._last_update_pct = pct
+            self.update_action_button.set_label(f'{pct} %')
+
+        return GLib.SOURCE_REMOVE
+
+    def restore_update_action_button(self):
+        # A progress refresh still pending would put the last percentage back
+        if self._update_pct_source:
+            GLib.source_remove(self._update_pct_source)
+            self._update_pct_source = 0
+
+        self._update_pct_scheduled = False
+        self.update_action_button.set_label(self.UPDATE_BTN_LABEL)
+        return GLib.SOURCE_REMOVE
+
     @idle
     def show_update_error_dialog(self, msg: str):
         logging.error(msg)
@@ -410,72 +702,68 @@ class AppDetails(Gtk.ScrolledWindow):
         self.secondary_action_button.set_sensitive(s)
         self.update_action_button.set_sensitive(s)
 
-    @idle
-    def restore_launch_button(self, restore_as):
-        self.secondary_action_button.set_label(restore_as)
-        self.secondary_action_button.set_sensitive(True)
+    def post_launch_animation(self):
+        self.cancel_post_launch_animation()
+        self._post_launch_source = GLib.timeout_add_seconds(5, self.on_post_launch_timeout)
 
-    def update_status_callback(self, status: bool):
-        if not status:
-            self.app_list_element.set_installed_status(InstalledStatus.ERROR)
+    def cancel_post_launch_animation(self):
+        if self._post_launch_source:
+            GLib.source_remove(self._post_launch_source)
+            self._post_launch_source = 0
 
-        self.update_installation_status()
+    def on_post_launch_timeout(self):
+        self._post_launch_source = 0
+        self.restore_launch_button()
+        return GLib.SOURCE_REMOVE
 
-    def update_installation_status(self):
-        self.primary_action_button.set_css_classes(self.common_btn_css_classes)
-        self.secondary_action_button.set_css_classes(self.common_btn_css_classes)
-        self.source_selector.set_visible(False)
+    def restore_launch_button(self):
+        # The label and sensitivity depend on the app status, e.g. untrusted or terminal apps
+        self.update_installation_status(force=True)
 
-        self.primary_action_button.set_sensitive(True)
-        self.secondary_action_button.set_sensitive(True)
+    def refresh_is_terminal(self):
+        # Reading the desktop entry is not free, cache the result on the element
+        el = self.app_list_element
+        el._is_terminal = bool(el.desktop_entry and el.desktop_entry.getTerminal())
 
-        if self.app_list_element.installed_status == InstalledStatus.INSTALLED:
-            if self.app_list_element.desktop_entry and self.app_list_element.desktop_entry.getTerminal():
-                self.secondary_action_button.set_label(_('This app runs in the terminal'))
-            else:
-                self.secondary_action_button.set_label(_('Launch'))
+    def update_status_callback(self, status: bool):
+        if not status:
+            self.app_list_element.set_installed_status(InstalledStatus.ERROR)
 
-            self.primary_action_button.set_label(_('Remove'))
-            self.primary_action_button.set_css_classes([*self.common_btn_css_classes, 'destructive-action'])
+        self.update_installation_status()
 
-        elif self.app_list_element.installed_status == InstalledStatus.UNINSTALLING:
-            self.primary_action_button.set_label(_('Uninstalling...'))
-            self.primary_action_button.set_sensitive(False)
+    def set_btn_prop(self, prop: str, setter: Callable, value):
+        # Skips GTK calls for labels and css classes that are already applied,
+        # code setting them directly has to drop the cached value
+        if value is None or self._applied_btn_props.get(prop) == value:
+            return
 
-        elif self.app_list_element.installed_status == InstalledStatus.INSTALLING:
-            self.primary_action_button.set_label(_('Installing...'))
-            self.primary_action_button.set_sensitive(False)
+        setter(value)
+        self._applied_btn_props[prop] = value
 
-        elif self.app_list_element.installed_status == InstalledStatus.NOT_INSTALLED:
-            if not self.app_list_element.desktop_entry:
-                self.secondary_action_button.set_label(_('Launch'))
-            else:
-                if self.app_list_element.desktop_entry.getTerminal():
-                    self.secondary_action_button.set_label(_('This app runs in the terminal'))
-                    self.secondary_action_button.set_sensitive(False)
-                else:
-                    self.secondary_action_button.set_label(_('Launch'))
+    def update_installation_status(self, force=False):
+        status_key = (
+            self.app_list_element.installed_status, 
+            self.app_list_element._is_terminal, 
+            self.app_list_element.trusted
+        )
 
-            self.primary_action_button.set_label(_('Move to the app menu'))
-            self.primary_action_button.set_css_classes([*self.common_btn_css_classes, 'suggested-action'])
+        if status_key == self._last_status_key and not force:
+            return
 
-        elif self.app_list_element.installed_status == InstalledStatus.UPDATE_AVAILABLE:
-            self.secondary_action_button.set_label(_('Update'))
-            self.secondary_action_button.set_css_classes([*self.common_btn_css_classes, 'suggested-action'])
+        self._last_status_key = status_key
+        btn_state = self.ACTION_BUTTONS_STATES[(self.app_list_element.installed_status, self.app_list_element._is_terminal)]
 
-            self.primary_action_button.set_label(_('Remove'))
-            self.primary_action_button.set_css_classes([*self.common_btn_css_classes, 'destructive-action'])
+        self.set_btn_prop('primary_label', self.primary_action_button.set_label, btn_state.primary_label)
+        self.set_btn_prop('primary_css', self.primary_action_button.set_css_classes, btn_state.primary_css)
+        self.set_btn_prop('secondary_label', self.secondary_action_button.set_label, btn_state.secondary_label)
+        self.set_btn_prop('secondary_css', self.secondary_action_button.set_css_classes, btn_state.secondary_css)
 
-        elif self.app_list_element.installed_status == InstalledStatus.UPDATING:
-            self.primary_action_button.set_label(self.CANCEL_UPDATE)
-            self.primary_action_button.set_sensitive(True)
-            self.primary_action_button.set_css_classes([*self.common_btn_css_classes, 'destructive-action'])
-            self.secondary_action_button.set_sensitive(False)
-            self.update_action_button.set_sensitive(False)
+        # sensitivity is also changed elsewhere, so it's always applied
+        self.primary_action_button.set_sensitive(btn_state.primary_sensitive)
+        self.secondary_action_button.set_sensitive(btn_state.secondary_sensitive)
 
-        elif self.app_list_element.installed_status == InstalledStatus.ERROR:
-            self.primary_action_button.set_label(_('Error'))
-            self.primary_action_button.set_css_classes([*self.common_btn_css_classes, 'destructive-action'])
+        if btn_state.update_sensitive is not None:
+            self.update_action_button.set_sensitive(btn_state.update_sensitive)
 
     def provider_refresh_installed_status(self, status: Optional[InstalledStatus] = None, final=False):
         if status:
@@ -485,7 +773,7 @@ class AppDetails(Gtk.ScrolledWindow):
 
     def show_invalid_arch_banner(self):
         self.window_banner.set_revealed(True)
-        self.window_banner.set_title(_('This app might not be compatible with your system architecture'))
+        self.window_banner.set_title(self.BANNER_INVALID_ARCH)
         self.window_banner.set_button_label('')
 
     @idle
@@ -503,8 +791,35 @@ class AppDetails(Gtk.ScrolledWindow):
         self.title.set_label('...')
         self.load()
 
-    @debounce(0.5)
-    @idle
+    def schedule_debounced(self, key: str, ms: int, fn: Callable, *args):
+        """Runs fn on the main loop after ms milliseconds, restarting the timer if called again with the same key"""
+        if key in self._debounce_sources:
+            GLib.source_remove(self._debounce_sources[key][0])
+
+        source = GLib.timeout_add(ms, self.on_debounce_timeout, key)
+        self._debounce_sources[key] = (source, fn, args)
+
+    def on_debounce_timeout(self, key: str):
+        source, fn, args = self._debounce_sources.pop(key)
+        fn(*args)
+        return GLib.SOURCE_REMOVE
+
+    def flush_debounced(self):
+        # Applies the pending changes before they can reach another app
+        for key in list(self._debounce_sources.keys()):
+            GLib.source_remove(self._debounce_sources[key][0])
+            self.on_debounce_timeout(key)
+
+    def cancel_debounced(self):
+        # Drops the pending changes, e.g. when the app has been removed
+        for source, fn, args in self._debounce_sources.values():
+            GLib.source_remove(source)
+
+        self._debounce_sources = {}
+
+    def on_web_browser_input_changed(self, widget):
+        self.schedule_debounced('website', 500, self.on_web_browser_input_apply, widget)
+
     def on_web_browser_input_apply(self, widget):
         app_conf = self.get_config_for_app()
 
@@ -521,13 +836,10 @@ class AppDetails(Gtk.ScrolledWindow):
             widget.remove_css_class('error')
 
         app_conf['website'] = text
-        save_config_for_app(app_conf)
+        self.queue_app_conf_patch({'website': text})
 
-    @idle
     def set_app_as_updatable(self):
-        self.update_action_button.set_visible(True)
-        self.update_action_button.set_label(self.UPDATE_FETCHING)
-        self.update_action_button.set_sensitive(False)
+        self.idle_update_action_button(visible=True, label=self.UPDATE_FETCHING, sensitive=False)
 
     @idle
     def set_update_information(self, manager: UpdateManager):
@@ -553,7 +865,7 @@ class AppDetails(Gtk.ScrolledWindow):
         manager = UpdateManagerChecker.check_url(update_url, self.app_list_element)
 
         if not manager:
-            GLib.idle_add(lambda: self.update_url_save_btn.set_visible(True))
+            GLib.idle_add(self.update_url_save_btn.set_visible, True)
             return
 
         self.set_app_as_updatable()
@@ -564,12 +876,26 @@ class AppDetails(Gtk.ScrolledWindow):
 
         if is_updatable:
             logging.debug(f'{self.app_list_element.name} is_updatable')
-            GLib.idle_add(lambda: self.update_action_button.set_label(self.UPDATE_BTN_LABEL))
-        else:
-            GLib.idle_add(lambda: self.update_action_button.set_label(self.UPDATE_NOT_AVAIL_BTN_LABEL))
 
-        GLib.idle_add(lambda: self.update_action_button.set_sensitive(True))
-        GLib.idle_add(lambda: self.update_action_button.set_sensitive(is_updatable))
+        self.idle_update_action_button(
+            label=(self.UPDATE_BTN_LABEL if is_updatable else self.UPDATE_NOT_AVAIL_BTN_LABEL),
+            sensitive=is_updatable
+        )
+
+    def idle_update_action_button(self, visible: Optional[bool] = None, label: Optional[str] = None, 
+                                  sensitive: Optional[bool] = None):
+        """Applies all the given properties of the update button in a single main loop callback"""
+        def apply():
+            if visible is not None:
+                self.update_action_button.set_visible(visible)
+
+            if label is not None:
+                self.update_action_button.set_label(label)
+
+            if sensitive is not None:
+                self.update_action_button.set_sensitive(sensitive)
+
+        GLib.idle_add(apply)
 
     def on_app_update_url_change(self, *props):
         app_conf = self.get_config_for_app()
@@ -591,13 +917,14 @@ class AppDetails(Gtk.ScrolledWindow):
 
     @_async
     def on_app_update_url_apply(self, ev):
-        app_conf = self.get_config_for_app()
+        # check_url can send a request, the user might open or remove another app in the meantime
+        el = self.app_list_element
         widget = self.update_url_row
 
         text = widget.get_text().strip()
 
-        GLib.idle_add(lambda: widget.remove_css_class('error'))
-        GLib.idle_add(lambda: widget.remove_css_class('success'))
+        GLib.idle_add(widget.remove_css_class, 'error')
+        GLib.idle_add(widget.remove_css_class, 'success')
 
         if text:
             manager_label = self.update_url_source.get_model().get_string(
@@ -608,35 +935,66 @@ class AppDetails(Gtk.ScrolledWindow):
             
             manager = UpdateManagerChecker.check_url(text, model=selected_manager)
             if not manager:
-                GLib.idle_add(lambda: widget.add_css_class('error'))
+                GLib.idle_add(self.complete_update_url_apply, el, None)
                 return
             
-            app_conf['update_url'] = manager.url
-            app_conf['update_url_manager'] = manager.name
+            patch = {'update_url': manager.url, 'update_url_manager': manager.name}
         else:
-            if 'update_url' in app_conf:
-                del app_conf['update_url']
-            
-            if 'update_url_manager' in app_conf:
-                del app_conf['update_url_manager']
+            patch = {'update_url': None, 'update_url_manager': None}
         
-        save_config_for_app(app_conf)
-        GLib.idle_add(lambda: widget.add_css_class('success'))
+        GLib.idle_add(self.complete_update_url_apply, el, patch)
+
+    def complete_update_url_apply(self, el: AppImageListElement, patch: Optional[dict]):
+        """Saves the update url checked by on_app_update_url_apply, a None patch marks the url as invalid"""
+        if el is not self.app_list_element or el.installed_status is not InstalledStatus.INSTALLED:
+            return GLib.SOURCE_REMOVE
+
+        if patch is None:
+            self.update_url_row.add_css_class('error')
+            return GLib.SOURCE_REMOVE
+
+        app_conf = self.get_config_for_app()
+
+        for k, v in patch.items():
+            if v is None:
+                app_conf.pop(k, None)
+            else:
+                app_conf[k] = v
+
+        self.queue_app_conf_patch(patch)
+        self.update_url_row.add_css_class('success')
+        return GLib.SOURCE_REMOVE
+
+    def track_env_var_key(self, key_widget: Gtk.Entry, key: Optional[str]):
+        """Keeps the number of env variables sharing the same key up to date, pass None when the widget is removed"""
+        old_key = self._env_last_key.pop(key_widget, '')
+
+        if old_key:
+            self._env_key_counts[old_key] -= 1
+
+            if not self._env_key_counts[old_key]:
+                del self._env_key_counts[old_key]
+
+        if key is None:
+            return
+
+        self._env_last_key[key_widget] = key
+
+        if key:
+            self._env_key_counts[key] = self._env_key_counts.get(key, 0) + 1
 
     def on_env_var_value_changed(self, widget, key_widget, value_widget):
         key = key_widget.get_text()
         value_widget.set_sensitive(len(key) > 0)
         key_widget.remove_css_class('error')
 
+        if self._env_last_key.get(key_widget) != key:
+            self.track_env_var_key(key_widget, key)
+
         if not key:
             return
         
-        counts = 0
-        for kv_widgets in self.env_variables_widgets:
-            k, v = kv_widgets
-            
-            if k.get_text() == key_widget.get_text():
-                counts += 1
+        counts = self._env_key_counts.get(key, 0)
 
         if counts > 1:
             key_widget.add_css_class('error')
@@ -648,33 +1006,90 @@ class AppDetails(Gtk.ScrolledWindow):
         widget.set_sensitive(False)
         self.update_env_variables()
         self.provider.update_desktop_file(self.app_list_element)
+        self.refresh_is_terminal()
 
     def on_delete_env_var_clicked(self, widget, key_widget, value_widget, listbox):
         for i, kv_widgets in enumerate(self.env_variables_widgets):
             k, v = kv_widgets
             
-            if k.get_text() == key_widget.get_text():
+            if k is key_widget:
                 self.env_variables_widgets.pop(i)
+                self.track_env_var_key(key_widget, None)
                 break
 
         self.update_env_variables()
         self.provider.update_desktop_file(self.app_list_element)
+        self.refresh_is_terminal()
 
         if self.env_variables_group_container:
             self.env_variables_group_container.remove(listbox)
 
-    @debounce(0.5)
-    @idle
     def on_cmd_arguments_changed(self, widget):
+        self.schedule_debounced('cmd_arguments', 500, self.on_cmd_arguments_apply, widget)
+
+    def on_cmd_arguments_apply(self, widget):
         text = widget.get_text().strip()
         text = text.replace('\n', '')
 
-        self.app_list_element.exec_arguments = shlex.split(text)
+        self.app_list_element.exec_arguments = fast_split(text)
         self.provider.update_desktop_file(self.app_list_element)
+        self.refresh_is_terminal()
+
+    def queue_app_conf_patch(self, patch: dict):
+        """Schedules a write of the given keys to the app config, a None value removes the key"""
+        self._pending_app_conf_patch.update(patch)
+
+        if not self._flush_source:
+            self._flush_source = GLib.timeout_add(400, self.on_flush_app_conf_timeout)
+
+    def on_flush_app_conf_timeout(self):
+        self._flush_source = 0
+        self.flush_app_conf()
+        return GLib.SOURCE_REMOVE
+
+    def cancel_app_conf_flush(self):
+        if self._flush_source:
+            GLib.source_remove(self._flush_source)
+            self._flush_source = 0
+
+    def flush_app_conf(self) -> Optional[threading.Thread]:
+        """Starts writing the pending config changes, returns the thread doing it if any"""
+        self.cancel_app_conf_flush()
+
+        if self._pending_app_conf_patch:
+            patch = self._pending_app_conf_patch
+            self._pending_app_conf_patch = {}
+            return self.write_app_conf_patch(self.app_list_element, patch)
+
+        return None
+
+    def flush_app_edits(self) -> Optional[threading.Thread]:
+        # Must be called on the main loop, before the config of the current app is read again
+        self.flush_debounced()
+        return self.flush_app_conf()
+
+    @_async_keepalive
+    def write_app_conf_patch(self, el: AppImageListElement, patch: dict):
+        app_conf = read_config_for_app(el)
+
+        for k, v in patch.items():
+            if v is None:
+                app_conf.pop(k, None)
+            else:
+                app_conf[k] = v
+
+        save_config_for_app(app_conf)
 
     # Returns the configuration from the json for this specific app
     def get_config_for_app(self) -> dict:
-        return read_config_for_app(self.app_list_element)
+        if self._app_conf is None:
+            self._app_conf = read_config_for_app(self.app_list_element)
+
+        return self._app_conf
+
+    # Returns the whole apps configuration along with the one for this app
+    def _read_apps_and_conf(self) -> tuple[dict, dict]:
+        return read_json_config('apps'), self.get_config_for_app()
 
     def on_web_browser_open_btn_clicked(self, widget):
         app_config = self.get_config_for_app()
@@ -688,19 +1103,25 @@ class AppDetails(Gtk.ScrolledWindow):
         launcher = Gtk.UriLauncher.new(url)
         launcher.launch()
 
-    @_async
     def on_refresh_metadata_btn_clicked(self, widget):
+        self.refresh_metadata(widget, self.flush_app_edits())
+
+    @_async
+    def refresh_metadata(self, widget, pending_write: Optional[threading.Thread]):
+        if pending_write:
+            pending_write.join()
+
+        self._extra_data_built_for = None
         self.show_row_spinner(True)
-        GLib.idle_add(lambda: widget.set_sensitive(False))
+        GLib.idle_add(widget.set_sensitive, False)
 
         self.provider.reload_metadata(self.app_list_element)
 
         icon = self.provider.get_icon(self.app_list_element)
         self.provider.refresh_title(self.app_list_element)
+        self._app_conf = None
 
-        generation = self.provider.get_appimage_generation(self.app_list_element)
-
-        self.complete_load(icon, generation)
+        self.complete_load(self.create_load_payload(icon))
 
     def on_open_folder_clicked(self, widget):
         path = Gio.File.new_for_path(os.path.dirname(self.app_list_element.file_path))
@@ -708,6 +1129,10 @@ class AppDetails(Gtk.ScrolledWindow):
         launcher.launch()
 
     def update_env_variables(self):
+        if self._env_vars_expanded_hdlr is not None:
+            # the editor rows were never built, nothing was edited
+            return
+
         self.app_list_element.env_variables = []
         for kv_widgets in self.env_variables_widgets:
             k, v = kv_widgets
@@ -722,39 +1147,54 @@ class AppDetails(Gtk.ScrolledWindow):
             if key:
                 self.app_list_element.env_variables.append(f'{key}={value}')
 
+        self.env_variables_count_label.set_label(str(len(self.app_list_element.env_variables)))
+
     def on_create_edit_row_btn_clicked(self, w):
+        self.env_variables_expander.set_expanded(True)
+        self.build_env_vars_rows()
+
         edit_form = self.create_edit_env_var_form()
-        self.env_variables_group_container.append(edit_form)
+        self.env_variables_group_container.attach(edit_form, 0, self._env_vars_grid_rows, 1, 1)
+        self._env_vars_grid_rows += 1
 
     # Create widgets methods
 
-    def create_edit_custom_website_row(self) -> Adw.EntryRow:
-        app_config = self.get_config_for_app()
-            
+    def decorate_row(self, row: Adw.PreferencesRow, icon_name: Optional[str] = None, 
+                     icon_resource: Optional[str] = None, suffix: Optional[Gtk.Widget] = None):
+        """Adds the leading icon and an optional suffix widget to a row of the details list"""
+        if icon_resource:
+            row_img = Gtk.Image(resource=icon_resource, pixel_size=self.ACTION_ROW_ICON_SIZE)
+        else:
+            row_img = Gtk.Image(icon_name=icon_name, pixel_size=self.ACTION_ROW_ICON_SIZE)
+
+        row.add_prefix(row_img)
+
+        if suffix:
+            row.add_suffix(suffix)
+
+        return row
+
+    def create_row_button(self, icon_name: str, tooltip_text: str, on_clicked: Callable) -> Gtk.Button:
+        row_btn = Gtk.Button(icon_name=icon_name, valign=Gtk.Align.CENTER, tooltip_text=tooltip_text)
+        row_btn.connect('clicked', on_clicked)
+
+        return row_btn
+
+    def create_edit_custom_website_row(self, app_config: dict) -> Adw.EntryRow:
         row = Adw.EntryRow(
             title=(_('Website') if ('website' in app_config and app_config['website']) else _('Add a website')),
             selectable=False,
             text=(app_config['website'] if 'website' in app_config else '')
         )
 
-        row_img = Gtk.Image(icon_name='gl-earth', pixel_size=self.ACTION_ROW_ICON_SIZE)
-        row_btn = Gtk.Button(
-            icon_name='gl-arrow2-top-right-symbolic', 
-            valign=Gtk.Align.CENTER, 
-            tooltip_text=_('Open URL'),
-        )
-        
-        row_btn.connect('clicked', self.on_web_browser_open_btn_clicked)
+        row_btn = self.create_row_button('gl-arrow2-top-right-symbolic', _('Open URL'), 
+                                         self.on_web_browser_open_btn_clicked)
 
-        row.connect('changed', self.on_web_browser_input_apply)
-        row.add_prefix(row_img)
-        row.add_suffix(row_btn)
+        self._rows_hdlrs['website'] = row.connect('changed', self.on_web_browser_input_changed)
 
-        return row
-
-    def create_edit_update_url_row(self) -> Adw.EntryRow:
-        app_config = self.get_config_for_app()
+        return self.decorate_row(row, icon_name='gl-earth', suffix=row_btn)
 
+    def create_edit_update_url_row(self, app_config: dict) -> Adw.EntryRow:
         save_btn_content = Adw.ButtonContent(
             icon_name='gearlever-check-plain-symbolic',
             label=_('Save')
@@ -801,26 +1241,40 @@ class AppDetails(Gtk.ScrolledWindow):
             text=(app_config.get('update_url', ''))
         )
 
-        row_img = Gtk.Image(icon_name='gl-software-update-available-symbolic', 
-                            pixel_size=self.ACTION_ROW_ICON_SIZE)
+        row_btn = self.create_row_button('gl-info-symbolic', _('How it works'), 
+                                         self.on_update_url_info_btn_clicked)
 
-        row_btn = Gtk.Button(
-            icon_name='gl-info-symbolic', 
-            valign=Gtk.Align.CENTER, 
-            tooltip_text=_('How it works'),
-        )
+        self._rows['update_url_source'] = self.update_url_source
+        self._rows['update_url'] = self.update_url_row
+        self._rows_hdlrs['update_url_source'] = self.update_url_source.connect('notify::selected', self.on_app_update_url_change)
+        self._rows_hdlrs['update_url'] = self.update_url_row.connect('changed', self.on_app_update_url_change)
 
-        row_btn.connect('clicked', self.on_update_url_info_btn_clicked)
-        self.update_url_source.connect('notify::selected', self.on_app_update_url_change)
-        self.update_url_row.connect('changed', self.on_app_update_url_change)
-
-        self.update_url_row.add_prefix(row_img)
-        self.update_url_row.add_suffix(row_btn)
+        self.decorate_row(self.update_url_row, icon_name='gl-software-update-available-symbolic', suffix=row_btn)
 
         group.add(self.update_url_source)
         group.add(self.update_url_row)
 
         return group
+
+    def refresh_update_url_group(self, app_config: dict):
+        # Restores the state create_edit_update_url_row leaves the group in
+        selected_model = app_config.get('update_url_manager', None)
+        selected = 0
+
+        for i, m in enumerate(UpdateManagerChecker.get_models()):
+            if selected_model == m.name:
+                selected = i
+
+        with self.update_url_source.handler_block(self._rows_hdlrs['update_url_source']):
+            self.update_url_source.set_selected(selected)
+
+        self.set_row_text('update_url', app_config.get('update_url', ''))
+        self.reset_validation_css(self.update_url_row)
+        self.update_url_row.set_editable(True)
+        self.update_url_source.set_sensitive(True)
+        self.update_url_save_btn.set_sensitive(False)
+        self.update_url_save_btn.set_visible(True)
+        self.update_url_group.set_description(self.UPDATE_INFO_NOT_EMBEDDED)
     
     def create_reload_metadata_row(self) -> Adw.EntryRow:
         row = Adw.ActionRow(selectable=False, activatable=True,
@@ -828,12 +1282,9 @@ class AppDetails(Gtk.ScrolledWindow):
             subtitle=_('Update information like icon, version and description.\nUseful if the app updated itself.')
         )
 
-        row_img = Gtk.Image(icon_name='gl-refresh', pixel_size=self.ACTION_ROW_ICON_SIZE)
-
-        row.add_prefix(row_img)
         row.connect('activated', self.on_refresh_metadata_btn_clicked)
 
-        return row
+        return self.decorate_row(row, icon_name='gl-refresh')
     
     def create_show_exec_args_row(self) -> Adw.ActionRow:
         row = Adw.EntryRow(
@@ -842,59 +1293,51 @@ class AppDetails(Gtk.ScrolledWindow):
             text=' '.join(self.app_list_element.exec_arguments)
         )
 
-        row_img = Gtk.Image(icon_name='gearlever-cmd-args', pixel_size=self.ACTION_ROW_ICON_SIZE)
-        row.connect('changed', self.on_cmd_arguments_changed)
-        row.add_prefix(row_img)
+        self._rows_hdlrs['exec_args'] = row.connect('changed', self.on_cmd_arguments_changed)
 
-        return row
+        return self.decorate_row(row, icon_name='gearlever-cmd-args')
+
+    def get_hash_subtitle(self, hashes: dict[str, str]) -> str:
+        return f'md5: {hashes["md5"]}\nsha1: {hashes["sha1"]}'
 
     def create_app_hash_row(self) -> Adw.ActionRow:
-        md5_hash = get_file_hash(Gio.File.new_for_path(self.app_list_element.file_path))
-        sha1_hash = get_file_hash(Gio.File.new_for_path(self.app_list_element.file_path), 'sha1')
         row = Adw.ActionRow(
-            subtitle=f'md5: {md5_hash}\nsha1: {sha1_hash}', 
+            subtitle=self.HASH_CALCULATING, 
             title=_('Hash'),
             selectable=True
         )
 
-        row_img = Gtk.Image(icon_name='gl-hash-symbolic', pixel_size=self.ACTION_ROW_ICON_SIZE)
-        row.add_prefix(row_img)
-
-        return row
+        return self.decorate_row(row, icon_name='gl-hash-symbolic')
     
     def create_exec_path_row(self) -> Adw.ActionRow:
         row = Adw.ActionRow(title=_('Path'), subtitle=self.app_list_element.file_path, subtitle_selectable=True, selectable=False)
-        row_img = Gtk.Image(icon_name='gearlever-file-manager-symbolic', pixel_size=self.ACTION_ROW_ICON_SIZE)
-        row_btn = Gtk.Button(icon_name='gl-arrow2-top-right-symbolic', valign=Gtk.Align.CENTER, tooltip_text=_('Open Folder'))
-        row_btn.connect('clicked', self.on_open_folder_clicked)
-        row.add_prefix(row_img)
-        row.add_suffix(row_btn)
+        row_btn = self.create_row_button('gl-arrow2-top-right-symbolic', _('Open Folder'), self.on_open_folder_clicked)
 
-        return row
+        return self.decorate_row(row, icon_name='gearlever-file-manager-symbolic', suffix=row_btn)
+
+    def get_package_info_subtitle(self, gen) -> str:
+        return f'{self.provider.name.capitalize()} Type. {gen}'
 
     def create_package_info_row(self, gen) -> Adw.ActionRow:
         row = Adw.ActionRow(
-            subtitle=f'{self.provider.name.capitalize()} Type. {gen}', 
+            subtitle=self.get_package_info_subtitle(gen), 
             title=_('Package type'),
             selectable=False
         )
 
-        row_img = Gtk.Image(resource=self.provider.icon, pixel_size=self.ACTION_ROW_ICON_SIZE)
-        row.add_prefix(row_img)
-
-        return row
+        return self.decorate_row(row, icon_resource=self.provider.icon)
     
     def create_edit_env_var_form(self, key='', value=''):
         listbox = Gtk.Box(
             orientation=Gtk.Orientation.HORIZONTAL,
             halign=Gtk.Align.CENTER,
             spacing=10,
-            margin_top=self.EXTRA_DATA_SPACING / 2,
-            margin_bottom=self.EXTRA_DATA_SPACING / 2,
+            margin_top=self.EXTRA_DATA_SPACING_HALF,
+            margin_bottom=self.EXTRA_DATA_SPACING_HALF,
         )
 
-        row_key = Gtk.Entry(placeholder_text=_('Key'), text=key, hexpand=True)
-        row_value = Gtk.Entry(placeholder_text=_('Value'), text=value, hexpand=True, sensitive=(len(key) > 0))
+        row_key = Gtk.Entry(placeholder_text=self.ENV_VAR_KEY_PLACEHOLDER, text=key, hexpand=True)
+        row_value = Gtk.Entry(placeholder_text=self.ENV_VAR_VALUE_PLACEHOLDER, text=value, hexpand=True, sensitive=(len(key) > 0))
         delete_btn = Gtk.Button(icon_name='gl-user-trash-symbolic', css_classes=['destructive-action'])
 
         row_key.connect('changed', self.on_env_var_value_changed, row_key, row_value)
@@ -907,6 +1350,7 @@ class AppDetails(Gtk.ScrolledWindow):
         listbox.append(delete_btn)
 
         self.env_variables_widgets.append([row_key, row_value])
+        self.track_env_var_key(row_key, key)
 
         return listbox
     
@@ -930,7 +1374,7 @@ class AppDetails(Gtk.ScrolledWindow):
         btn_container = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5, 
                                 valign=Gtk.Align.CENTER)
 
-        [btn_container.append(w) for w in [self.save_vars_btn, add_item_btn]]
+        append_all(btn_container, self.save_vars_btn, add_item_btn)
 
         group = Adw.PreferencesGroup(
             title=_('Environment variables'),
@@ -938,21 +1382,76 @@ class AppDetails(Gtk.ScrolledWindow):
             header_suffix=btn_container,
         )
 
-        self.env_variables_group_container = Gtk.Box(
-            orientation=Gtk.Orientation.VERTICAL,
-            css_classes=['card'],
-            margin_top=self.EXTRA_DATA_SPACING / 2
+        self.env_variables_group_container = None
+
+        # The editor rows are only built when the variables are shown for the first time
+        self.env_variables_expander = Adw.ExpanderRow(title=_('Variables'))
+        self.env_variables_count_label = Gtk.Label(
+            label=str(len(self.app_list_element.env_variables)), 
+            css_classes=['dim-label']
         )
 
-        group.add(self.env_variables_group_container)
+        self.env_variables_expander.add_suffix(self.env_variables_count_label)
+        self._env_vars_expanded_hdlr = self.env_variables_expander.connect('notify::expanded', self.on_env_vars_expanded)
+
+        group.add(self.env_variables_expander)
 
         add_item_btn.connect('clicked', self.on_create_edit_row_btn_clicked)
 
         self.env_variables_widgets = []
+        self._env_key_counts = {}
+        self._env_last_key = {}
+
+        return group
+
+    def reset_env_vars_rows(self):
+        # Drops the editor rows, they will be built again from the current app when expanded
+        self.env_variables_expander.set_expanded(False)
+
+        if self.env_variables_group_container:
+            self.env_variables_expander.remove(self.env_variables_group_container)
+            self.env_variables_group_container = None
+
+        self.env_variables_widgets = []
+        self._env_key_counts = {}
+        self._env_last_key = {}
+        self.save_vars_btn.set_sensitive(False)
+        self.env_variables_count_label.set_label(str(len(self.app_list_element.env_variables)))
+
+        if self._env_vars_expanded_hdlr is None:
+            self._env_vars_expanded_hdlr = self.env_variables_expander.connect('notify::expanded', self.on_env_vars_expanded)
+
+    def on_env_vars_expanded(self, widget, *args):
+        if widget.get_expanded():
+            self.build_env_vars_rows()
+
+    def build_env_vars_rows(self):
+        if self._env_vars_expanded_hdlr is None:
+            return
+
+        self.env_variables_expander.disconnect(self._env_vars_expanded_hdlr)
+        self._env_vars_expanded_hdlr = None
+
+        # A grid needs fewer measure passes than a box to lay out its rows
+        container = Gtk.Grid(
+            css_classes=['card'],
+            margin_top=self.EXTRA_DATA_SPACING_HALF
+        )
+
+        make_row = self.create_edit_env_var_form
+        attach = container.attach
+
+        rows = []
         for kv in self.app_list_element.env_variables:
-            k, v = kv.split('=', 1)
+            k, sep, v = kv.partition('=')
+            rows.append(make_row(k, v))
+
+        for i, row in enumerate(rows):
+            attach(row, 0, i, 1, 1)
 
-            row = self.create_edit_env_var_form(k, v)
-            self.env_variables_group_container.append(row)
+        self._env_vars_grid_rows = len(rows)
 
-        return group
\ No newline at end of file
+        # Parent the container only once it's filled, so that adding the rows 
+        # doesn't trigger a new measure of the visible widgets each time
+        self.env_variables_expander.add_row(container)
+        self.env_variables_group_container = container
\ No newline at end of file
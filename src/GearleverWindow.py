@@ -259,6 +259,7 @@ class GearleverWindow(Gtk.ApplicationWindow):
         )
 
     def on_close_request(self, widget):
+        self.app_details.flush_app_edits()
         appimage_provider.extraction_folder_cleanup()
 
     def on_window_maximixed_changed(self, *args):
@@ -1,41 +1,89 @@
+from __future__ import annotations
+
 import logging
 import json
 import gi
 import os
 import base64
-from ..models.AppListElement import AppListElement
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..models.AppListElement import AppListElement
 
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 
-from gi.repository import GLib, GdkPixbuf  # noqa
+from gi.repository import GLib  # noqa
+
+# Constant for the lifetime of the process
+_CONFIG_DIR = GLib.get_user_config_dir()
+
+# Parsed configs by path, along with the (mtime, size) of the file they were read from
+_cache: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
+def _file_stamp(stat: os.stat_result) -> tuple[int, int]:
+    return (stat.st_mtime_ns, stat.st_size)
 
 
 def read_json_config(name: str):
-    path = f'{GLib.get_user_config_dir()}/{name}.json'
-    logging.debug(f'Reading config from {path}')
+    path = f'{_CONFIG_DIR}/{name}.json'
+
+    cached = _cache.get(path)
+
+    try:
+        if not cached or cached[0] != _file_stamp(os.stat(path)):
+            logging.debug(f'Reading config from {path}')
 
-    if not os.path.isfile(path):
+            with open(path, 'rb') as file:
+                # stamp the content with the file that was actually read
+                stamp = _file_stamp(os.fstat(file.fileno()))
+                cached = (stamp, json.loads(file.read() or b'{}'))
+                _cache[path] = cached
+    except FileNotFoundError:
+        _cache.pop(path, None)
         return {}
 
-    with open(path, 'r') as file:
-        return json.loads(file.read() or '{}')
+    # callers can add or remove top level keys, nested values are shared with the cache
+    return dict(cached[1])
 
 def set_json_config(name: str, data):
-    path = f'{GLib.get_user_config_dir()}/{name}.json'
+    path = f'{_CONFIG_DIR}/{name}.json'
 
-    with open(path, 'w+') as file:
-        file.write(json.dumps(data))
-        logging.info(f'Saving config to {path}')
+    # Write to a temporary file first, so that the config is never left half written
+    tmp_path = f'{path}.{threading.get_ident()}.tmp'
+
+    try:
+        with open(tmp_path, 'w') as file:
+            json.dump(data, file, separators=(',', ':'))
+            logging.info(f'Saving config to {path}')
+    except Exception:
+        # don't leave a partial file behind in the config folder
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        raise
+
+    os.replace(tmp_path, path)
+    _cache.pop(path, None)
+
+def get_app_b64name(el: AppListElement) -> str:
+    # Memoized on the element, names can still change when its metadata is refreshed
+    cached = getattr(el, '_b64name', None)
+
+    if not cached or cached[0] != el.name:
+        cached = (el.name, base64.b64encode(el.name.encode('utf8')).decode('ascii'))
+        el._b64name = cached
+
+    return cached[1]
 
 def read_config_for_app(el: AppListElement) -> dict:
     conf = read_json_config('apps')
-    b64name = base64.b64encode(el.name.encode('utf8')).decode('ascii')
-
-    app_config = conf[b64name] if b64name in conf else {}
-    app_config['b64name'] = b64name
+    b64name = get_app_b64name(el)
 
-    return app_config
+    # return a new dict, the stored one is shared with the cache
+    return {**conf.get(b64name, {}), 'b64name': b64name}
 
 def save_config_for_app(app_conf):
     conf = read_json_config('apps')
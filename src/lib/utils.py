@@ -6,6 +6,7 @@ import time
 import logging
 import gi
 import hashlib
+import shlex
 from . import terminal
 
 from .costants import APP_ID
@@ -35,6 +36,12 @@ def key_in_dict(_dict: dict, key_lookup: str, separator='.'):
     return subdict
 
 
+def append_all(parent: Gtk.Widget, *children: Gtk.Widget):
+    """Appends every child to a container widget, in order"""
+    for child in children:
+        parent.append(child)
+
+
 def add_page_to_adw_stack(stack: Adw.ViewStack, page: Gtk.Widget, name: str, title: str, icon: str):
     stack.add_titled(page, name, title)
     stack.get_page(page).set_icon_name(icon)
@@ -80,13 +87,27 @@ def gio_copy(file: Gio.File, destination: Gio.File):
 
 
 def get_file_hash(file: Gio.File, alg='md5') -> str:
+    if alg not in ['md5', 'sha1']:
+        raise Exception('Invalid hash requested')
+
+    return get_file_hashes(file, (alg,))[alg]
+
+
+def get_file_hashes(file: Gio.File, algs=('md5', 'sha1'), chunk_size=1 << 20) -> dict[str, str]:
+    """
+        Reads the file once and returns a dictionary with the hex digest for every requested algorithm
+    """
     with open(file.get_path(), 'rb') as f:
-        if alg == 'md5':
-            return hashlib.md5(f.read()).hexdigest()
-        elif alg == 'sha1':
-            return hashlib.sha1(f.read()).hexdigest()
+        if len(algs) == 1 and hasattr(hashlib, 'file_digest'):
+            return {algs[0]: hashlib.file_digest(f, algs[0]).hexdigest()}
 
-    raise Exception('Invalid hash requested')
+        hashes = {alg: hashlib.new(alg) for alg in algs}
+
+        while buf := f.read(chunk_size):
+            for h in hashes.values():
+                h.update(buf)
+
+    return {alg: h.hexdigest() for alg, h in hashes.items()}
 
 
 def send_notification(notification=Gio.Notification, tag=None):
@@ -136,6 +157,18 @@ def url_is_valid(url: str) -> bool:
 
     return True if url_regex.match(url) else False
 
+_shell_quoting_chars = re.compile(r'[\\\'"]')
+_shell_words = re.compile(r'[^ \t\r\n]+')
+
+def fast_split(text: str) -> list[str]:
+    """
+        Same as shlex.split, skipping the shlex parser when the text has no quotes or escapes
+    """
+    if _shell_quoting_chars.search(text):
+        return shlex.split(text)
+
+    return _shell_words.findall(text)
+
 def get_random_string():
     return ''.join((random.choice('abcdxyzpqr123456789') for i in range(10)))
 
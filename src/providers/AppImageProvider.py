@@ -12,7 +12,7 @@ from ..models.AppListElement import AppListElement, InstalledStatus
 from ..lib.async_utils import _async, idle
 from ..lib.json_config import save_config_for_app, read_config_for_app
 from ..lib.utils import get_giofile_content_type, get_gsettings, gio_copy, get_file_hash, \
-    remove_special_chars, get_random_string, show_message_dialog, get_osinfo
+    remove_special_chars, get_random_string, show_message_dialog, get_osinfo, fast_split
 from ..models.Models import AppUpdateElement, InternalError, DownloadInterruptedException
 from typing import Optional, List, TypedDict
 from gi.repository import GLib, Gtk, Gdk, Gio, Adw
@@ -108,8 +108,8 @@ class AppImageProvider():
                         after_exec = entry.getExec()[exec_index:]
                         before_exec = entry.getExec()[:exec_index]
 
-                        exec_tokens = shlex.split(after_exec)[1:]
-                        before_exec_tokens = shlex.split(before_exec)
+                        exec_tokens = fast_split(after_exec)[1:]
+                        before_exec_tokens = fast_split(before_exec)
 
                         if before_exec and before_exec_tokens[0] == 'env':
                             [env_variables.append(v) for v in before_exec_tokens[1:]]